@@ -1,4 +1,3 @@
-import pandas as pd
 from sqlalchemy.orm import Session
 from database import SessionLocal, engine
 import sys
@@ -11,6 +10,9 @@ from datetime import datetime
 
 def load_sample_data():
     """Load sample data from CSV files into the database"""
+    # Imported here so pandas is only loaded when seeding actually runs
+    import pandas as pd
+
     db = SessionLocal()
     
     try:
@@ -1,3 +1,4 @@
+import os
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from db.database import create_tables
@@ -30,6 +31,15 @@ app.include_router(loan.router)
 def startup_event():
     """Create database tables on startup"""
     create_tables()
+    # The ML stack is loaded lazily on the first loan request. Set
+    # LOAN_MODEL_WARMUP=true to pay that cost at startup instead.
+    if os.getenv("LOAN_MODEL_WARMUP", "false").lower() == "true":
+        loan.loan_predictor.warm_up()
+
+@app.on_event("shutdown")
+def shutdown_event():
+    """Stop the loan scoring executor on shutdown"""
+    loan.loan_scheduler.shutdown()
 
 @app.get("/")
 def read_root():
@@ -42,6 +52,7 @@ def read_root():
             "customers": "/customers",
             "transactions": "/transactions",
             "loan_prediction": "/loan/predict",
+            "loan_metrics": "/loan/metrics",
             "health": "/health"
         }
     }
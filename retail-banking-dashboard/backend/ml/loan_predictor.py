@@ -1,19 +1,52 @@
-from sklearn.linear_model import LogisticRegression
-from sklearn.preprocessing import StandardScaler
-import numpy as np
-import pandas as pd
-import joblib
 import os
+import threading
+
+# sklearn, pandas, numpy and joblib are imported inside the methods that need
+# them so that importing this module (and therefore the API) stays cheap.
+# The ML stack is only loaded on first use or via warm_up().
 
 class LoanPredictor:
     def __init__(self):
-        self.model = LogisticRegression(random_state=42)
-        self.scaler = StandardScaler()
+        self._model = None
+        self._scaler = None
         self.is_trained = False
+        self.accuracy = None
+        self._train_lock = threading.RLock()
         self.feature_names = ['income', 'credit_score', 'employment_type_encoded']
+
+    @property
+    def model(self):
+        """Logistic regression model, created on first access"""
+        if self._model is None:
+            from sklearn.linear_model import LogisticRegression
+            self._model = LogisticRegression(random_state=42)
+        return self._model
+
+    @model.setter
+    def model(self, value):
+        self._model = value
+
+    @property
+    def scaler(self):
+        """Feature scaler, created on first access"""
+        if self._scaler is None:
+            from sklearn.preprocessing import StandardScaler
+            self._scaler = StandardScaler()
+        return self._scaler
+
+    @scaler.setter
+    def scaler(self, value):
+        self._scaler = value
+
+    def warm_up(self):
+        """Load the ML stack and train the model ahead of the first prediction"""
+        self._ensure_trained()
         
     def prepare_training_data(self):
         """Create synthetic training data for the loan prediction model"""
+        import numpy as np
+        import pandas as pd
+
         np.random.seed(42)
         n_samples = 1000
         
@@ -46,6 +79,9 @@ class LoanPredictor:
     
     def train(self):
         """Train the loan prediction model"""
+        from sklearn.linear_model import LogisticRegression
+        from sklearn.preprocessing import StandardScaler
+
         # Get training data
         data = self.prepare_training_data()
         
@@ -53,19 +89,39 @@ class LoanPredictor:
         X = data[self.feature_names]
         y = data['approved']
         
-        # Scale features
-        X_scaled = self.scaler.fit_transform(X)
+        # Fit fresh objects so concurrent predictions never see a half-fitted model
+        scaler = StandardScaler()
+        X_scaled = scaler.fit_transform(X)
+        model = LogisticRegression(random_state=42)
+        model.fit(X_scaled, y)
         
-        # Train model
-        self.model.fit(X_scaled, y)
-        self.is_trained = True
+        with self._train_lock:
+            self.scaler = scaler
+            self.model = model
+            self.accuracy = model.score(X_scaled, y)
+            self.is_trained = True
         
-        return self.model.score(X_scaled, y)
+        return self.accuracy
+    
+    def evaluate(self):
+        """Return the model accuracy on the training data, computed once"""
+        self._ensure_trained()
+        if self.accuracy is None:
+            # Loaded models have no cached score (for demo purposes)
+            data = self.prepare_training_data()
+            X_scaled = self.scaler.transform(data[self.feature_names])
+            self.accuracy = self.model.score(X_scaled, data['approved'])
+        return self.accuracy
     
     def predict(self, income, credit_score, employment_type):
         """Predict loan approval for given parameters"""
-        if not self.is_trained:
-            self.train()
+        return self.predict_batch([(income, credit_score, employment_type)])[0]
+    
+    def predict_batch(self, applications):
+        """Predict loan approval for a list of (income, credit_score, employment_type) tuples"""
+        import numpy as np
+
+        self._ensure_trained()
         
         # Encode employment type
         employment_mapping = {
@@ -73,28 +129,42 @@ class LoanPredictor:
             'employed': 1,
             'self-employed': 2
         }
-        employment_encoded = employment_mapping.get(employment_type.lower(), 1)
         
         # Prepare features
-        features = np.array([[income, credit_score, employment_encoded]])
+        features = np.array([
+            [income, credit_score, employment_mapping.get(employment_type.lower(), 1)]
+            for income, credit_score, employment_type in applications
+        ], dtype=float)
         features_scaled = self.scaler.transform(features)
         
-        # Make prediction
-        prediction = self.model.predict(features_scaled)[0]
-        probability = self.model.predict_proba(features_scaled)[0][1]
+        # Make predictions in a single vectorized call
+        predictions = self.model.predict(features_scaled)
+        probabilities = self.model.predict_proba(features_scaled)[:, 1]
         
         # Get feature importance for explanation
         coefficients = self.model.coef_[0]
-        feature_contributions = features_scaled[0] * coefficients
-        
-        return {
-            'approved': bool(prediction),
-            'probability': float(probability),
-            'reasoning': self._generate_explanation(
-                income, credit_score, employment_type, 
-                feature_contributions, probability
-            )
-        }
+        feature_contributions = features_scaled * coefficients
+        
+        return [
+            {
+                'approved': bool(prediction),
+                'probability': float(probability),
+                'reasoning': self._generate_explanation(
+                    income, credit_score, employment_type,
+                    contributions, probability
+                )
+            }
+            for (income, credit_score, employment_type), prediction, probability, contributions
+            in zip(applications, predictions, probabilities, feature_contributions)
+        ]
+    
+    def _ensure_trained(self):
+        """Train the model once, even when called from several threads"""
+        if self.is_trained:
+            return
+        with self._train_lock:
+            if not self.is_trained:
+                self.train()
     
     def _generate_explanation(self, income, credit_score, employment_type, contributions, probability):
         """Generate human-readable explanation for the prediction"""
@@ -139,6 +209,7 @@ class LoanPredictor:
     def save_model(self, filepath):
         """Save the trained model"""
         if self.is_trained:
+            import joblib
             joblib.dump({
                 'model': self.model,
                 'scaler': self.scaler
@@ -147,7 +218,9 @@ class LoanPredictor:
     def load_model(self, filepath):
         """Load a pre-trained model"""
         if os.path.exists(filepath):
+            import joblib
             loaded = joblib.load(filepath)
             self.model = loaded['model']
             self.scaler = loaded['scaler']
+            self.accuracy = None
             self.is_trained = True
\ No newline at end of file
@@ -0,0 +1,226 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+class LoanCapacityExceeded(Exception):
+    """Raised when the loan scoring queue is full and a request is shed"""
+
+    def __init__(self, retry_after):
+        super().__init__("Loan scoring is at capacity")
+        self.retry_after = retry_after
+
+class LoanSchedulerMetrics:
+    """Thread-safe counters for queue wait and batch size"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.rejected = 0
+        self.batches = 0
+        self.max_batch_size = 0
+        self.total_queue_wait = 0.0
+        self.max_queue_wait = 0.0
+
+    def record_rejection(self):
+        with self._lock:
+            self.rejected += 1
+
+    def record_batch(self, queue_waits):
+        with self._lock:
+            self.batches += 1
+            self.requests += len(queue_waits)
+            self.max_batch_size = max(self.max_batch_size, len(queue_waits))
+            self.total_queue_wait += sum(queue_waits)
+            self.max_queue_wait = max(self.max_queue_wait, *queue_waits)
+
+    def snapshot(self):
+        """Return the current metrics as a plain dict"""
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "rejected": self.rejected,
+                "batches": self.batches,
+                "avg_batch_size": round(self.requests / self.batches, 2) if self.batches else 0.0,
+                "max_batch_size": self.max_batch_size,
+                "avg_queue_wait_ms": round(self.total_queue_wait / self.requests * 1000, 3) if self.requests else 0.0,
+                "max_queue_wait_ms": round(self.max_queue_wait * 1000, 3)
+            }
+
+class _BatchWindow:
+    """Requests collected on one event loop, waiting to be flushed as a batch"""
+
+    def __init__(self):
+        self.pending = []
+        self.flush_handle = None
+
+def _set_exception(future, error):
+    if not future.done():
+        future.set_exception(error)
+
+class LoanScheduler:
+    """Run loan scoring in a dedicated bounded executor with micro-batching.
+
+    Requests arriving within ``batch_window`` seconds of each other are scored
+    together in one vectorized ``predict_batch`` call. At most
+    ``max_concurrency`` batches run at once. ``max_queue_depth`` bounds the
+    requests waiting for a worker: it only applies while every worker is
+    busy, and counts requests already handed to the executor plus those
+    collecting in a batch window. Past it, new requests are rejected with
+    ``LoanCapacityExceeded`` instead of being queued.
+
+    The scheduler may be shared between event loops. Each loop gets its own
+    batch window, and all shared state is guarded by a lock.
+    """
+
+    def __init__(self, predictor, max_concurrency=2, max_queue_depth=64,
+                 max_batch_size=32, batch_window=0.005, retry_after=1):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        if max_queue_depth < 0:
+            raise ValueError("max_queue_depth must not be negative")
+        if batch_window < 0:
+            raise ValueError("batch_window must not be negative")
+
+        self.predictor = predictor
+        self.max_concurrency = max_concurrency
+        self.max_queue_depth = max_queue_depth
+        self.max_batch_size = max_batch_size
+        self.batch_window = batch_window
+        self.retry_after = retry_after
+        self.metrics = LoanSchedulerMetrics()
+        self._executor = None
+        self._lock = threading.Lock()
+        self._active = 0
+        self._queued = 0
+        self._windows = {}
+
+    @property
+    def queue_depth(self):
+        """Number of requests handed to the executor but not yet started"""
+        with self._lock:
+            return self._queued
+
+    async def submit(self, income, credit_score, employment_type):
+        """Score one application, sharing a model call with concurrent requests"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        with self._lock:
+            # Windows left on closed loops can never flush; drop them
+            for stale in [other for other in self._windows if other.is_closed()]:
+                del self._windows[stale]
+
+            waiting = self._queued + sum(len(window.pending) for window in self._windows.values())
+            if self._active >= self.max_concurrency and waiting >= self.max_queue_depth:
+                self.metrics.record_rejection()
+                raise LoanCapacityExceeded(self.retry_after)
+
+            window = self._windows.setdefault(loop, _BatchWindow())
+            window.pending.append(((income, credit_score, employment_type), future, time.perf_counter()))
+            flush_now = len(window.pending) >= self.max_batch_size
+            if not flush_now and window.flush_handle is None:
+                window.flush_handle = loop.call_later(self.batch_window, self._flush, loop)
+
+        if flush_now:
+            self._flush(loop)
+
+        return await future
+
+    async def run(self, func, *args):
+        """Run a one-off callable (e.g. training) on the loan executor"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            self._active += 1
+        try:
+            return await loop.run_in_executor(self._get_executor(), func, *args)
+        finally:
+            with self._lock:
+                self._active -= 1
+
+    def shutdown(self):
+        """Fail requests still in a batch window and stop the executor"""
+        with self._lock:
+            windows, self._windows = self._windows, {}
+            executor, self._executor = self._executor, None
+
+        error = RuntimeError("Loan scheduler is shutting down")
+        for loop, window in windows.items():
+            # A timer that still fires finds no window and does nothing
+            if window.flush_handle is not None and not loop.is_closed():
+                try:
+                    loop.call_soon_threadsafe(window.flush_handle.cancel)
+                except RuntimeError:
+                    pass
+            self._fail(window.pending, error)
+
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def _get_executor(self):
+        """Create the executor on first use, and again after a shutdown"""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_concurrency, thread_name_prefix="loan-scoring"
+                )
+            return self._executor
+
+    def _flush(self, loop):
+        """Hand the requests pending on ``loop`` to the executor as one batch"""
+        with self._lock:
+            window = self._windows.get(loop)
+            if window is None or not window.pending:
+                return
+            if window.flush_handle is not None:
+                window.flush_handle.cancel()
+                window.flush_handle = None
+            batch, window.pending = window.pending, []
+            self._active += 1
+            self._queued += len(batch)
+
+        try:
+            scoring = loop.run_in_executor(self._get_executor(), self._score, batch)
+        except Exception as e:
+            with self._lock:
+                self._active -= 1
+                self._queued -= len(batch)
+            self._fail(batch, e)
+            return
+        scoring.add_done_callback(lambda done: self._resolve(batch, done))
+
+    def _score(self, batch):
+        """Executor side: record queue wait, then score the batch in one call"""
+        started = time.perf_counter()
+        with self._lock:
+            self._queued -= len(batch)
+        try:
+            self.metrics.record_batch([started - enqueued for _, _, enqueued in batch])
+            return self.predictor.predict_batch([application for application, _, _ in batch])
+        finally:
+            with self._lock:
+                self._active -= 1
+
+    def _resolve(self, batch, done):
+        """Event loop side: deliver results or the error to each waiting request"""
+        if done.cancelled():
+            self._fail(batch, asyncio.CancelledError())
+            return
+        error = done.exception()
+        if error:
+            self._fail(batch, error)
+            return
+        for (_, future, _), result in zip(batch, done.result()):
+            if not future.done():
+                future.set_result(result)
+
+    def _fail(self, batch, error):
+        """Propagate an error to every request in the batch, from any thread"""
+        for _, future, _ in batch:
+            try:
+                future.get_loop().call_soon_threadsafe(_set_exception, future, error)
+            except RuntimeError:
+                # The loop has closed, so nothing is waiting on this future
+                pass
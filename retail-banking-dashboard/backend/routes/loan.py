@@ -1,12 +1,25 @@
+import os
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from ml.loan_predictor import LoanPredictor
+from ml.loan_scheduler import LoanScheduler, LoanCapacityExceeded
 
 router = APIRouter(prefix="/loan", tags=["loan"])
 
 # Initialize loan predictor
 loan_predictor = LoanPredictor()
 
+# Loan scoring runs in its own bounded executor so bursts of predictions
+# cannot starve the shared threadpool used by the other endpoints
+loan_scheduler = LoanScheduler(
+    loan_predictor,
+    max_concurrency=int(os.getenv("LOAN_MAX_CONCURRENCY", "2")),
+    max_queue_depth=int(os.getenv("LOAN_MAX_QUEUE_DEPTH", "64")),
+    max_batch_size=int(os.getenv("LOAN_MAX_BATCH_SIZE", "32")),
+    batch_window=float(os.getenv("LOAN_BATCH_WINDOW_MS", "5")) / 1000,
+    retry_after=int(os.getenv("LOAN_RETRY_AFTER_SECONDS", "1"))
+)
+
 class LoanRequest(BaseModel):
     income: float
     credit_score: int
@@ -18,7 +31,7 @@ class LoanResponse(BaseModel):
     reasoning: str
 
 @router.post("/predict", response_model=LoanResponse)
-def predict_loan_approval(request: LoanRequest):
+async def predict_loan_approval(request: LoanRequest):
     """Predict loan approval based on customer financial data"""
     try:
         # Validate input
@@ -30,7 +43,7 @@ def predict_loan_approval(request: LoanRequest):
             raise HTTPException(status_code=400, detail="Employment type must be 'unemployed', 'employed', or 'self-employed'")
         
         # Make prediction
-        result = loan_predictor.predict(
+        result = await loan_scheduler.submit(
             income=request.income,
             credit_score=request.credit_score,
             employment_type=request.employment_type
@@ -38,21 +51,34 @@ def predict_loan_approval(request: LoanRequest):
         
         return LoanResponse(**result)
     
+    except LoanCapacityExceeded as e:
+        raise HTTPException(
+            status_code=503,
+            detail="Loan scoring is at capacity, please retry shortly",
+            headers={"Retry-After": str(e.retry_after)}
+        )
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Prediction error: {str(e)}")
 
+@router.get("/metrics")
+def get_scoring_metrics():
+    """Get queue wait and batch size metrics for loan scoring"""
+    return {
+        **loan_scheduler.metrics.snapshot(),
+        "queue_depth": loan_scheduler.queue_depth,
+        "max_queue_depth": loan_scheduler.max_queue_depth,
+        "max_concurrency": loan_scheduler.max_concurrency
+    }
+
 @router.get("/model-info")
-def get_model_info():
+async def get_model_info():
     """Get information about the loan prediction model"""
-    if not loan_predictor.is_trained:
-        accuracy = loan_predictor.train()
-    else:
-        # Calculate accuracy on training data (for demo purposes)
-        data = loan_predictor.prepare_training_data()
-        X = data[loan_predictor.feature_names]
-        y = data['approved']
-        X_scaled = loan_predictor.scaler.transform(X)
-        accuracy = loan_predictor.model.score(X_scaled, y)
+    accuracy = loan_predictor.accuracy
+    if accuracy is None:
+        # First-call training runs on the loan executor, not the shared threadpool
+        accuracy = await loan_scheduler.run(loan_predictor.evaluate)
     
     return {
         "model_type": "Logistic Regression",
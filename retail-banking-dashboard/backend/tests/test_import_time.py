@@ -0,0 +1,94 @@
+import os
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Framework modules imported before main in the profiled run, so the budget
+# covers only what this app adds on top of FastAPI and SQLAlchemy
+FRAMEWORK_MODULES = [
+    "fastapi", "fastapi.middleware.cors", "pydantic",
+    "sqlalchemy", "sqlalchemy.orm", "sqlalchemy.ext.declarative"
+]
+
+# Import budget for main on top of the frameworks, in milliseconds. Measured
+# at roughly 75-85 ms with the ML stack deferred; loading sklearn and pandas
+# eagerly adds about 1.7 s.
+IMPORT_TIME_BUDGET_MS = float(os.getenv("IMPORT_TIME_BUDGET_MS", "500"))
+
+# Modules that must only be loaded once the loan subsystem is used
+HEAVY_MODULES = ["sklearn", "pandas", "numpy", "joblib"]
+
+def run_python(code, *args):
+    """Run a snippet in a fresh interpreter from the backend directory"""
+    return subprocess.run(
+        [sys.executable, *args, "-c", code],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+
+def parse_importtime(stderr):
+    """Parse `-X importtime` output into (module, self_us, cumulative_us, depth) rows"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return rows
+
+def main_subtree(rows):
+    """Return the rows imported by `import main`, ending with main itself.
+
+    `-X importtime` prints each module after its dependencies, so main's
+    subtree is the run of nested rows directly above its depth-0 row. This
+    leaves out modules already loaded during interpreter startup or by the
+    framework imports.
+    """
+    end = next(i for i, row in enumerate(rows) if row[0] == "main" and row[3] == 0)
+    start = end
+    while start > 0 and rows[start - 1][3] > 0:
+        start -= 1
+    return rows[start:end + 1]
+
+def format_report(rows, top=15):
+    """Render the slowest imports as a readable table"""
+    slowest = sorted(rows, key=lambda row: row[2], reverse=True)[:top]
+    lines = [f"{'module':<50} {'self ms':>10} {'cumul ms':>10}"]
+    for name, self_us, cumulative_us, _ in slowest:
+        lines.append(f"{name:<50} {self_us / 1000:>10.1f} {cumulative_us / 1000:>10.1f}")
+    return "\n".join(lines)
+
+def test_main_does_not_import_ml_stack():
+    """Importing the app must not load the ML dependencies"""
+    code = (
+        "import sys, main\n"
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    loaded = run_python(code).stdout.strip()
+
+    assert loaded == "", f"ML modules loaded at import time: {loaded}"
+
+def test_main_import_time_budget():
+    """Profile `import main` and fail if startup regresses past the budget"""
+    code = f"import {', '.join(FRAMEWORK_MODULES)}\nimport main"
+    result = run_python(code, "-X", "importtime")
+    all_rows = parse_importtime(result.stderr)
+    rows = main_subtree(all_rows)
+    total_ms = rows[-1][2] / 1000
+    framework_ms = sum(
+        cumulative_us for name, _, cumulative_us, depth in all_rows
+        if depth == 0 and name.split(".")[0] in ("fastapi", "pydantic", "sqlalchemy")
+    ) / 1000
+    report = format_report(rows)
+
+    print(f"\nFramework imports: {framework_ms:.1f} ms (not budgeted)")
+    print(f"Import time for main: {total_ms:.1f} ms (budget {IMPORT_TIME_BUDGET_MS:.0f} ms)")
+    print(report)
+
+    assert total_ms <= IMPORT_TIME_BUDGET_MS, (
+        f"Importing main took {total_ms:.1f} ms, over the {IMPORT_TIME_BUDGET_MS:.0f} ms budget\n{report}"
+    )
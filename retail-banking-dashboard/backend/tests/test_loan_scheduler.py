@@ -0,0 +1,235 @@
+import asyncio
+import threading
+import time
+import pytest
+from fastapi.testclient import TestClient
+from main import app
+from ml.loan_scheduler import LoanScheduler, LoanCapacityExceeded
+from routes import loan
+
+class RecordingPredictor:
+    """Stand-in predictor that records the size of each batch it scores"""
+
+    def __init__(self):
+        self.batches = []
+
+    def predict_batch(self, applications):
+        self.batches.append(len(applications))
+        return [
+            {"approved": credit_score >= 700, "probability": credit_score / 850, "reasoning": employment_type}
+            for _, credit_score, employment_type in applications
+        ]
+
+class BlockingPredictor(RecordingPredictor):
+    """Predictor that holds its worker until released"""
+
+    def __init__(self):
+        super().__init__()
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def predict_batch(self, applications):
+        self.started.set()
+        self.release.wait(timeout=5)
+        return super().predict_batch(applications)
+
+def test_concurrent_requests_are_micro_batched():
+    """Requests arriving inside the batch window share one model call"""
+    predictor = RecordingPredictor()
+    scheduler = LoanScheduler(predictor, batch_window=0.05)
+
+    async def score_all():
+        return await asyncio.gather(*[
+            scheduler.submit(50000, score, "employed") for score in (600, 700, 800)
+        ])
+
+    results = asyncio.run(score_all())
+    scheduler.shutdown()
+
+    assert predictor.batches == [3]
+    assert [result["approved"] for result in results] == [False, True, True]
+    metrics = scheduler.metrics.snapshot()
+    assert metrics["batches"] == 1
+    assert metrics["requests"] == 3
+    assert metrics["max_batch_size"] == 3
+    assert metrics["avg_queue_wait_ms"] >= 0
+    assert scheduler.queue_depth == 0
+
+def test_batches_are_capped_at_max_batch_size():
+    """A full batch is dispatched without waiting for the window"""
+    predictor = RecordingPredictor()
+    scheduler = LoanScheduler(predictor, max_batch_size=2, batch_window=0.05)
+
+    async def score_all():
+        return await asyncio.gather(*[
+            scheduler.submit(50000, 700, "employed") for _ in range(5)
+        ])
+
+    asyncio.run(score_all())
+    scheduler.shutdown()
+
+    assert sorted(predictor.batches) == [1, 2, 2]
+
+def test_requests_over_capacity_are_rejected():
+    """Once every worker is busy, requests beyond the queue depth are shed"""
+    predictor = BlockingPredictor()
+    scheduler = LoanScheduler(
+        predictor, max_concurrency=1, max_queue_depth=1, max_batch_size=1, retry_after=3
+    )
+
+    async def score_all():
+        running = asyncio.create_task(scheduler.submit(50000, 700, "employed"))
+        await asyncio.to_thread(predictor.started.wait, 5)
+        queued = asyncio.create_task(scheduler.submit(50000, 700, "employed"))
+        await asyncio.sleep(0)
+        try:
+            with pytest.raises(LoanCapacityExceeded) as rejected:
+                await scheduler.submit(50000, 700, "employed")
+        finally:
+            predictor.release.set()
+        await asyncio.gather(running, queued)
+        return rejected.value
+
+    rejected = asyncio.run(score_all())
+    scheduler.shutdown()
+
+    assert rejected.retry_after == 3
+    assert predictor.batches == [1, 1]
+    assert scheduler.metrics.snapshot()["rejected"] == 1
+
+def test_zero_queue_depth_admits_when_workers_idle():
+    """A queue depth of 0 only sheds load when no worker is free"""
+    scheduler = LoanScheduler(RecordingPredictor(), max_queue_depth=0)
+
+    result = asyncio.run(scheduler.submit(50000, 750, "employed"))
+    scheduler.shutdown()
+
+    assert result["approved"] is True
+
+def test_scheduler_recovers_from_abandoned_event_loop():
+    """State left inside the batch window of a finished loop is discarded"""
+    scheduler = LoanScheduler(RecordingPredictor(), batch_window=1)
+
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(asyncio.wait_for(scheduler.submit(50000, 700, "employed"), timeout=0.01))
+
+    scheduler.batch_window = 0.01
+    result = asyncio.run(asyncio.wait_for(scheduler.submit(50000, 750, "employed"), timeout=5))
+    scheduler.shutdown()
+
+    assert result["approved"] is True
+    assert scheduler.queue_depth == 0
+
+def test_requests_from_concurrent_event_loops_all_complete():
+    """Each live event loop keeps its own batch window"""
+    predictor = RecordingPredictor()
+    scheduler = LoanScheduler(predictor, batch_window=0.2)
+    results = [None, None]
+
+    def score_on_own_loop(index):
+        results[index] = asyncio.run(
+            asyncio.wait_for(scheduler.submit(50000, 750, "employed"), timeout=2)
+        )
+
+    threads = [threading.Thread(target=score_on_own_loop, args=(i,)) for i in range(2)]
+    threads[0].start()
+    time.sleep(0.05)
+    threads[1].start()
+    for thread in threads:
+        thread.join()
+    scheduler.shutdown()
+
+    assert all(result is not None and result["approved"] for result in results)
+    assert predictor.batches == [1, 1]
+
+def test_invalid_configuration_is_rejected():
+    """Settings that would make every request hang fail fast instead"""
+    for settings in (
+        {"max_concurrency": 0},
+        {"max_batch_size": 0},
+        {"max_queue_depth": -1},
+        {"batch_window": -0.1}
+    ):
+        with pytest.raises(ValueError):
+            LoanScheduler(RecordingPredictor(), **settings)
+
+def test_dispatch_failure_fails_batch_and_restores_counters():
+    """A batch that cannot reach the executor errors instead of hanging"""
+    scheduler = LoanScheduler(RecordingPredictor(), max_queue_depth=0, batch_window=0.01)
+
+    def broken_executor():
+        raise RuntimeError("executor unavailable")
+
+    scheduler._get_executor = broken_executor
+    with pytest.raises(RuntimeError, match="executor unavailable"):
+        asyncio.run(asyncio.wait_for(scheduler.submit(50000, 750, "employed"), timeout=2))
+    del scheduler._get_executor
+
+    result = asyncio.run(asyncio.wait_for(scheduler.submit(50000, 750, "employed"), timeout=2))
+    scheduler.shutdown()
+
+    assert result["approved"] is True
+    assert scheduler.queue_depth == 0
+
+def test_shutdown_fails_requests_in_batch_window():
+    """Shutdown fails pending requests instead of leaving them to a stale timer"""
+    scheduler = LoanScheduler(RecordingPredictor(), batch_window=1)
+
+    async def submit_then_shutdown():
+        pending = asyncio.create_task(scheduler.submit(50000, 700, "employed"))
+        await asyncio.sleep(0)
+        scheduler.shutdown()
+        return await asyncio.gather(pending, return_exceptions=True)
+
+    results = asyncio.run(submit_then_shutdown())
+
+    assert isinstance(results[0], RuntimeError)
+    assert scheduler.metrics.snapshot()["batches"] == 0
+
+def test_predictor_errors_reach_every_request():
+    """A failing batch fails each request in it"""
+    class FailingPredictor:
+        def predict_batch(self, applications):
+            raise ValueError("model unavailable")
+
+    scheduler = LoanScheduler(FailingPredictor(), batch_window=0.05)
+
+    async def score_all():
+        return await asyncio.gather(*[
+            scheduler.submit(50000, 700, "employed") for _ in range(2)
+        ], return_exceptions=True)
+
+    results = asyncio.run(score_all())
+    scheduler.shutdown()
+
+    assert all(isinstance(result, ValueError) for result in results)
+
+def test_predict_returns_503_when_at_capacity(monkeypatch):
+    """The loan endpoint sheds load with 503 and Retry-After"""
+    predictor = BlockingPredictor()
+    scheduler = LoanScheduler(predictor, max_concurrency=1, max_queue_depth=0, retry_after=2)
+    monkeypatch.setattr(loan, "loan_scheduler", scheduler)
+    client = TestClient(app)
+
+    # Occupy the only worker from another event loop
+    busy = threading.Thread(target=asyncio.run, args=(scheduler.submit(50000, 700, "employed"),))
+    busy.start()
+    assert predictor.started.wait(timeout=5)
+
+    try:
+        response = client.post("/loan/predict", json={
+            "income": 75000,
+            "credit_score": 750,
+            "employment_type": "employed"
+        })
+        metrics = client.get("/loan/metrics").json()
+    finally:
+        predictor.release.set()
+        busy.join()
+        scheduler.shutdown()
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "2"
+    assert metrics["rejected"] == 1
+    assert metrics["max_queue_depth"] == 0
+    assert predictor.batches == [1]